@@ -147,7 +147,7 @@ resource "null_resource" "data_import" {
   ]
 
   provisioner "local-exec" {
-    command = "pip3 install pymongo && python3 mdb_import.py"
+    command = "pip3 install 'pymongo[zstd]>=4.10' numpy pyarrow && python3 mdb_import.py"
     working_dir = path.module
   }
 
@@ -266,6 +266,31 @@ resource "aws_iam_role_policy" "semantic_search_lambda_policy" {
   })
 }
 
+# Install orjson for the Lambda runtime (python3.12 on x86_64) into a layer directory
+resource "null_resource" "orjson_layer_build" {
+  provisioner "local-exec" {
+    command = "pip3 install orjson --platform manylinux2014_x86_64 --implementation cp --python-version 3.12 --only-binary=:all: --upgrade -t layers/orjson/python"
+    working_dir = path.module
+  }
+}
+
+# Package the orjson layer
+data "archive_file" "orjson_layer_zip" {
+  type        = "zip"
+  source_dir  = "${path.module}/layers/orjson"
+  output_path = "${path.module}/orjson_layer.zip"
+  
+  depends_on = [null_resource.orjson_layer_build]
+}
+
+# orjson layer shared by the semantic search and todos Lambdas
+resource "aws_lambda_layer_version" "orjson" {
+  layer_name          = "orjson"
+  filename            = data.archive_file.orjson_layer_zip.output_path
+  source_code_hash    = data.archive_file.orjson_layer_zip.output_base64sha256
+  compatible_runtimes = ["python3.12"]
+}
+
 # Generate Lambda function from template
 resource "local_file" "semantic_search_lambda" {
   content = templatefile("${path.module}/semantic_search_lambda_template.py", {
@@ -294,6 +319,7 @@ resource "aws_lambda_function" "semantic_search" {
   source_code_hash = data.archive_file.semantic_search_lambda_zip.output_base64sha256
   runtime         = "python3.12"
   timeout         = 30
+  layers          = [aws_lambda_layer_version.orjson.arn]
   
   environment {
     variables = {
@@ -496,6 +522,7 @@ resource "aws_lambda_function" "todos_service" {
   source_code_hash = data.archive_file.todos_lambda_zip.output_base64sha256
   runtime         = "python3.12"
   timeout         = 30
+  layers          = [aws_lambda_layer_version.orjson.arn]
   
   environment {
     variables = {
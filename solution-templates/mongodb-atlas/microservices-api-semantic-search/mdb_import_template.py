@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 import csv
 import logging
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from bson.binary import Binary, BinaryVectorDtype
 from pymongo import MongoClient
 
 # Configure logging
@@ -13,36 +17,81 @@ logger = logging.getLogger('mdb_import')
 # MongoDB connection - using direct connection string instead of AWS Secrets Manager
 mongodb_uri = "${mongodb_connection_string}"  # Replace with your MongoDB Atlas connection string
 logger.info("Connecting to MongoDB Atlas")
-client = MongoClient(mongodb_uri)
+# zstd wire compression keeps the embedding-heavy batches small on the wire
+client = MongoClient(mongodb_uri, w=1, retryWrites=True, compressors='zstd')
 db = client['travel']
 collection = db['asia']
 
 # CSV file path
 csv_file_path = './anthropic-travel-agency.trip_recommendations.csv'
 
+# Number of documents sent per insert_many round trip
+BATCH_SIZE = 1000
+
+# Bytes of CSV parsed per streamed record batch; memory stays bounded by this, not the file size
+READ_BLOCK_SIZE = 64 << 20
+
+def flush(batch):
+    """
+    Insert the accumulated documents in a single round trip
+    """
+    collection.insert_many(batch, ordered=False)
+
+def quantize_int8(emb):
+    """
+    Scalar-quantize each embedding row to int8 with its own scale;
+    cosine ranking is scale invariant
+    """
+    scales = np.abs(emb).max(axis=1, keepdims=True) / 127
+    scales[scales == 0] = 1
+    return np.round(emb / scales).astype(np.int8)
+
 logger.info('Starting data import from CSV to MongoDB')
 
-index = 1
-with open(csv_file_path, mode='r') as csvfile:
-    reader = csv.DictReader(csvfile)
-    for row in reader:
-        # logger.debug(f"Processing row type: {type(row)}")
-        row['index'] = index
+# Read the header once and partition column positions in a single pass; every
+# record batch is then sliced by position with no per-column name checks
+# (utf-8-sig drops a leading BOM; Arrow is then handed these exact names and skips the header row)
+with open(csv_file_path, mode='r', newline='', encoding='utf-8-sig') as csvfile:
+    columns = next(csv.reader(csvfile))
+emb_idx, meta_idx = [], []
+for position, column in enumerate(columns):
+    (emb_idx if column.startswith('details_embedding') else meta_idx).append(position)
+emb_cols = [columns[i] for i in emb_idx]
+meta_cols = [columns[i] for i in meta_idx]
+
+# Metadata columns stay strings and embedding columns parse straight to float32; the memory-mapped
+# file is tokenized by Arrow's multi-threaded parser without creating a Python object per cell
+column_types = {c: pa.string() for c in meta_cols}
+column_types.update({c: pa.float32() for c in emb_cols})
+reader = pacsv.open_csv(
+    pa.memory_map(csv_file_path),
+    read_options=pacsv.ReadOptions(block_size=READ_BLOCK_SIZE, column_names=columns, skip_rows=1),
+    # Long text columns may contain quoted line breaks
+    parse_options=pacsv.ParseOptions(newlines_in_values=True),
+    convert_options=pacsv.ConvertOptions(column_types=column_types)
+)
+
+index = 0
+batch = []
+for record_batch in reader:
+    # Stack the Arrow float32 column buffers into one row-major matrix
+    emb_q = quantize_int8(np.column_stack([record_batch.column(i).to_numpy() for i in emb_idx]))
+    meta = record_batch.select(meta_idx).to_pylist()
+    
+    for new_row, vector in zip(meta, emb_q):
         index += 1
+        new_row['index'] = index
+        # Native BSON int8 vector: 1 byte per dimension instead of an array of 8-byte doubles
+        new_row['details_embedding'] = Binary.from_vector(vector.tolist(), BinaryVectorDtype.INT8)
+        batch.append(new_row)
         
-        # loop over columns and accumulate all detail_embedding into an array
-        detail_embedding = []
-        new_row = {}
-        for column in row.keys():
-            if column.startswith('details_embedding'):
-                detail_embedding.append(float(row[column]))
-            else:
-                new_row[column] = row[column]
-        
-        new_row['details_embedding'] = detail_embedding
-        collection.insert_one(new_row)
-        
-        if index % 25 == 0:
+        if len(batch) >= BATCH_SIZE:
+            flush(batch)
+            batch.clear()
             logger.info(f'Inserted {index} rows')
 
+if batch:
+    flush(batch)
+    logger.info(f'Inserted {index} rows')
+
 logger.info('Finished import successfully')
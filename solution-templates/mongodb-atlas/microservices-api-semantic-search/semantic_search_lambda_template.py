@@ -1,46 +1,210 @@
 #!/usr/bin/env python3
-import json
+import base64
+import functools
+import hashlib
+import hmac
+import orjson
 import boto3
+import math
 import os
-from botocore.auth import SigV4Auth
-from botocore.awsrequest import AWSRequest
-from urllib.request import urlopen, Request
-from urllib.error import HTTPError
+import struct
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from botocore.config import Config
+from urllib.parse import quote, urlsplit
+from urllib3 import PoolManager, Retry, Timeout, make_headers
 
 # Environment variables (set by Terraform)
 MONGODB_API_URL = "${mongodb_api_url}"
 AWS_REGION = os.environ['AWS_REGION']
 
-def generate_embedding(text):
+# Clients are created once per container and reused across warm invocations
+_SESSION = boto3.Session()
+_CREDS = _SESSION.get_credentials()
+_BEDROCK = _SESSION.client(
+    'bedrock-runtime',
+    region_name=AWS_REGION,
+    config=Config(tcp_keepalive=True, max_pool_connections=50, retries={'mode': 'adaptive'})
+)
+_HTTP = PoolManager(
+    num_pools=10,
+    maxsize=50,
+    retries=Retry(total=2, backoff_factor=0.1),
+    timeout=Timeout(connect=3, read=10)
+)
+
+# SigV4 parts that are fixed for every Data API call are computed once per container
+SIGNING_SERVICE = 'execute-api'
+_API_HOST = urlsplit(MONGODB_API_URL).netloc
+_API_BASE_PATH = urlsplit(MONGODB_API_URL).path
+_SCOPE_SUFFIX = f"/{AWS_REGION}/{SIGNING_SERVICE}/aws4_request"
+_SIGNING_KEYS = {}  # (secret_key, date_stamp) -> derived signing key
+
+# Ask for compressed responses; urllib3 decodes them transparently
+_ACCEPT_ENCODING = make_headers(accept_encoding=True)['accept-encoding']
+
+# Upper bound on queries accepted in a single multi-query request
+MAX_BATCH_QUERIES = 16
+
+# Largest accepted result limit; keeps numCandidates (capped at 1000) above the limit
+MAX_SEARCH_LIMIT = 100
+
+# Semantic response cache: near-duplicate queries reuse a recent search result;
+# each entry holds a ~6 KB float32 unit vector plus a small result document
+SEMANTIC_CACHE_SIZE = 256
+SEMANTIC_CACHE_THRESHOLD = 0.97
+SEMANTIC_CACHE_TTL = 300  # seconds
+_RESP_CACHE = deque(maxlen=SEMANTIC_CACHE_SIZE)  # (unit_vector, limit, result, timestamp)
+
+def pack_vector_int8(vector):
     """
-    Generate embeddings using AWS Bedrock Titan Text Embeddings V1 model
+    Scalar-quantize a vector to int8 and encode it as a BSON Binary vector
+    (subtype 9, int8) in Extended JSON, matching how the import script
+    stores details_embedding
     """
-    bedrock = boto3.client('bedrock-runtime', region_name=AWS_REGION)
-    
-    body = json.dumps({
+    scale = max(abs(v) for v in vector) / 127 or 1
+    quantized = [round(v / scale) for v in vector]
+    # Header: dtype byte (0x03 = INT8) followed by a zero padding byte
+    data = b'\x03\x00' + struct.pack(f'<{len(quantized)}b', *quantized)
+    return {"$binary": {"base64": base64.b64encode(data).decode(), "subType": "09"}}
+
+# About 6 KB per cached float32 vector, so a full cache stays near 3 MB
+@functools.lru_cache(maxsize=512)
+def _embed_cached(text):
+    """
+    Call Bedrock for a normalized query; results live for the container lifetime
+    (Titan embeddings are deterministic, so cached vectors never go stale)
+    """
+    body = orjson.dumps({
         "inputText": text
     })
     
     try:
-        response = bedrock.invoke_model(
+        response = _BEDROCK.invoke_model(
             modelId='amazon.titan-embed-text-v1',
             body=body,
             contentType='application/json',
             accept='application/json'
         )
         
-        response_body = json.loads(response['body'].read())
-        return response_body['embedding']
+        response_body = orjson.loads(response['body'].read())
+        # Packed float32 storage instead of Python floats; callers must not modify it
+        return array('f', response_body['embedding'])
     
     except Exception as e:
         print(f"Error generating embedding: {e}")
         raise
 
+def generate_embedding(text):
+    """
+    Generate embeddings using AWS Bedrock Titan Text Embeddings V1 model,
+    serving repeated queries from an in-memory LRU cache
+    """
+    return _embed_cached(text.strip().lower())
+
+def generate_embeddings_batch(texts, max_workers=16):
+    """
+    Generate embeddings for several texts with parallel Bedrock requests
+    over the shared client; results are returned in input order
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(texts)))) as executor:
+        return list(executor.map(generate_embedding, texts))
+
+def unit_vector(vector):
+    """
+    Scale a vector to unit length so cosine similarity reduces to a dot product
+    """
+    norm = math.sqrt(math.sumprod(vector, vector)) or 1
+    return array('f', (v / norm for v in vector))
+
+def lookup_cached_response(query_unit, limit):
+    """
+    Return the cached result of the most similar recent query with the same limit,
+    or None if no entry is above SEMANTIC_CACHE_THRESHOLD
+    """
+    now = time.time()
+    best_result, best_similarity = None, SEMANTIC_CACHE_THRESHOLD
+    # Snapshot first: parallel searches may append while this one scans
+    for cached_unit, cached_limit, result, timestamp in tuple(_RESP_CACHE):
+        if cached_limit != limit or now - timestamp > SEMANTIC_CACHE_TTL:
+            continue
+        similarity = math.sumprod(query_unit, cached_unit)
+        if similarity > best_similarity:
+            best_result, best_similarity = result, similarity
+    return best_result
+
+def store_cached_response(query_unit, limit, result):
+    """
+    Remember a search result; the deque evicts the oldest entry when full
+    """
+    _RESP_CACHE.append((query_unit, limit, result, time.time()))
+
+def _signing_key(secret_key, date_stamp):
+    """
+    Derive the SigV4 signing key; it only changes with the credentials or the
+    UTC date, so one derivation serves every request until midnight
+    """
+    cache_key = (secret_key, date_stamp)
+    key = _SIGNING_KEYS.get(cache_key)
+    if key is None:
+        key = ('AWS4' + secret_key).encode()
+        for part in (date_stamp, AWS_REGION, SIGNING_SERVICE, 'aws4_request'):
+            key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+        _SIGNING_KEYS.clear()
+        _SIGNING_KEYS[cache_key] = key
+    return key
+
+def sign_request(endpoint, body, extra_headers=None):
+    """
+    Build SigV4-signed headers for a POST of body (bytes) to a MongoDB Data API endpoint;
+    extra_headers (lowercase names) are sent and signed along with the defaults
+    """
+    credentials = _CREDS.get_frozen_credentials()
+    amz_date = time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())
+    date_stamp = amz_date[:8]
+    
+    headers = {'content-type': 'application/json', 'host': _API_HOST, 'x-amz-date': amz_date}
+    if extra_headers:
+        headers.update(extra_headers)
+    if credentials.token:
+        headers['x-amz-security-token'] = credentials.token
+    signed_headers = ';'.join(sorted(headers))
+    canonical_headers = ''.join(f"{name}:{headers[name]}\n" for name in sorted(headers))
+    
+    canonical_request = '\n'.join([
+        'POST',
+        quote(_API_BASE_PATH + endpoint, safe='/~'),
+        '',
+        canonical_headers,
+        signed_headers,
+        hashlib.sha256(body).hexdigest()
+    ])
+    scope = f"{date_stamp}{_SCOPE_SUFFIX}"
+    string_to_sign = '\n'.join([
+        'AWS4-HMAC-SHA256',
+        amz_date,
+        scope,
+        hashlib.sha256(canonical_request.encode()).hexdigest()
+    ])
+    signature = hmac.new(
+        _signing_key(credentials.secret_key, date_stamp), string_to_sign.encode(), hashlib.sha256
+    ).hexdigest()
+    
+    headers['authorization'] = (
+        f"AWS4-HMAC-SHA256 Credential={credentials.access_key}/{scope}, "
+        f"SignedHeaders={signed_headers}, Signature={signature}"
+    )
+    return headers
+
 def call_mongodb_api(pipeline):
     """
     Call MongoDB Data API aggregate endpoint with AWS SigV4 authentication
     """
-    url = f"{MONGODB_API_URL}aggregate"
+    endpoint = 'aggregate'
+    url = f"{MONGODB_API_URL}{endpoint}"
     
     data = {
         "database": "travel",
@@ -48,32 +212,66 @@ def call_mongodb_api(pipeline):
         "pipeline": pipeline
     }
     
-    # Create AWS request with SigV4 signing
-    session = boto3.Session()
-    credentials = session.get_credentials()
-    
-    request = AWSRequest(
-        method='POST',
-        url=url,
-        data=json.dumps(data),
-        headers={'Content-Type': 'application/json'}
-    )
-    SigV4Auth(credentials, 'execute-api', AWS_REGION).add_auth(request)
-    
-    # Make the request using urllib
-    req = Request(url, data=request.body, headers=dict(request.headers))
+    # Sign the request with the cached SigV4 key
+    body = orjson.dumps(data)
+    headers = sign_request(endpoint, body, {'accept-encoding': _ACCEPT_ENCODING})
     
+    # Make the request over the pooled keep-alive connection
     try:
-        with urlopen(req) as response:
-            response_data = response.read().decode()
-            return json.loads(response_data)
-    except HTTPError as e:
-        error_body = e.read().decode() if hasattr(e, 'read') else str(e)
-        print(f"MongoDB API HTTP Error {e.code}: {error_body}")
-        raise Exception(f"MongoDB API error: {e.code}")
+        response = _HTTP.request('POST', url, body=body, headers=headers)
     except Exception as e:
         print(f"Error calling MongoDB API: {e}")
         raise
+    
+    if response.status >= 400:
+        print(f"MongoDB API HTTP Error {response.status}: {response.data.decode()}")
+        raise Exception(f"MongoDB API error: {response.status}")
+    
+    return orjson.loads(response.data)
+
+def vector_search(query_vector, limit):
+    """
+    Run the $vectorSearch pipeline for one query vector, consulting the
+    semantic cache first
+    """
+    # Skip the vector search entirely for near-duplicates of a recent query
+    query_unit = unit_vector(query_vector)
+    cached_result = lookup_cached_response(query_unit, limit)
+    if cached_result is not None:
+        print("Serving result from semantic cache")
+        return cached_result
+    
+    # Size the HNSW candidate list to the requested limit (10x, clamped to 100-1000)
+    num_candidates = min(max(limit * 10, 100), 1000)
+    
+    # Construct vector search pipeline: int8 query vector, candidate pool sized to the limit,
+    # and a projection returning only index, Place Name and score
+    vector_search_pipeline = [
+        {
+            "$vectorSearch": {
+                "index": "vector_index",
+                "path": "details_embedding",
+                "queryVector": pack_vector_int8(query_vector),
+                "numCandidates": num_candidates,
+                "limit": limit
+            }
+        },
+        {
+            "$project": {
+                # Only what clients read; "index" identifies the document once _id is dropped
+                "_id": 0,
+                "index": 1,
+                "Place Name": 1,
+                "score": {"$meta": "vectorSearchScore"}
+            }
+        }
+    ]
+    
+    # Call MongoDB Data API
+    print("Calling MongoDB Data API aggregate endpoint")
+    result = call_mongodb_api(vector_search_pipeline)
+    store_cached_response(query_unit, limit, result)
+    return result
 
 def lambda_handler(event, context):
     """
@@ -82,7 +280,13 @@ def lambda_handler(event, context):
     Expected input:
     {
         "query": "search text",
-        "limit": 5  // optional, defaults to 5
+        "limit": 5  // optional integer from 1 to 100, defaults to 5
+    }
+    
+    or, to search several queries at once (embedded and searched in parallel):
+    {
+        "queries": ["search text", "other search text"],
+        "limit": 5  // optional integer from 1 to 100, defaults to 5
     }
     
     Returns:
@@ -93,51 +297,65 @@ def lambda_handler(event, context):
     """
     try:
         # Parse input
-        body = json.loads(event.get('body', '{}'))
+        body = orjson.loads(event.get('body', '{}'))
         query = body.get('query')
+        queries = body.get('queries')
         limit = body.get('limit', 5)
         
+        if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= MAX_SEARCH_LIMIT:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json'},
+                'body': orjson.dumps({'error': f'limit must be an integer from 1 to {MAX_SEARCH_LIMIT}'}).decode()
+            }
+        
+        if queries is not None:
+            if (not isinstance(queries, list) or not 0 < len(queries) <= MAX_BATCH_QUERIES
+                    or not all(isinstance(q, str) and q for q in queries)):
+                return {
+                    'statusCode': 400,
+                    'headers': {'Content-Type': 'application/json'},
+                    'body': orjson.dumps({'error': f'queries must be a list of 1 to {MAX_BATCH_QUERIES} non-empty strings'}).decode()
+                }
+            
+            # Repeated queries are embedded and searched once, then fanned back out
+            unique_queries = list(dict.fromkeys(queries))
+            print(f"Generating embeddings for {len(unique_queries)} queries")
+            query_vectors = generate_embeddings_batch(unique_queries)
+            
+            # The Data API round trips dominate, so the searches run in parallel too
+            with ThreadPoolExecutor(max_workers=len(query_vectors)) as executor:
+                search_results = dict(zip(
+                    unique_queries,
+                    executor.map(vector_search, query_vectors, repeat(limit))
+                ))
+            results = [
+                {'query': q, 'result': search_results[q]}
+                for q in queries
+            ]
+            return {
+                'statusCode': 200,
+                'headers': {'Content-Type': 'application/json'},
+                'body': orjson.dumps({'results': results}).decode()
+            }
+        
         if not query:
             return {
                 'statusCode': 400,
                 'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({'error': 'query parameter is required'})
+                'body': orjson.dumps({'error': 'query parameter is required'}).decode()
             }
         
         # Generate embedding for the query
         print(f"Generating embedding for query: {query}")
         query_vector = generate_embedding(query)
-        
-        # Construct vector search pipeline (same as test_api_template.py)
-        vector_search_pipeline = [
-            {
-                "$vectorSearch": {
-                    "index": "vector_index",
-                    "path": "details_embedding",
-                    "queryVector": query_vector,
-                    "numCandidates": 100,
-                    "limit": limit
-                }
-            },
-            {
-                "$project": {
-                    "_id": 1,
-                    "index": 1,
-                    "Place Name": 1,
-                    "score": {"$meta": "vectorSearchScore"}
-                }
-            }
-        ]
-        
-        # Call MongoDB Data API
-        print("Calling MongoDB Data API aggregate endpoint")
-        result = call_mongodb_api(vector_search_pipeline)
+        result = vector_search(query_vector, limit)
         
         # Return response in same format as test_api.py
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps(result)
+            'body': orjson.dumps(result).decode()
         }
         
     except Exception as e:
@@ -145,5 +363,5 @@ def lambda_handler(event, context):
         return {
             'statusCode': 500,
             'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': 'Internal server error'})
+            'body': orjson.dumps({'error': 'Internal server error'}).decode()
         }
@@ -2,12 +2,14 @@
 import boto3
 import json
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from botocore.auth import SigV4Auth
 from botocore.awsrequest import AWSRequest
 
 # Detect current AWS region
 session = boto3.Session()
 current_region = session.region_name
+credentials = session.get_credentials()
 
 def make_request(data):
     """
@@ -16,9 +18,6 @@ def make_request(data):
     api_url = "${api_url}"
     url = f"{api_url}/search"
     
-    session = boto3.Session()
-    credentials = session.get_credentials()
-    
     request = AWSRequest(
         method='POST', 
         url=url, 
@@ -33,37 +32,29 @@ def make_request(data):
 if __name__ == "__main__":
     print("Testing Semantic Search API")
     
-    # Test 1: Simple search query
-    print("\n1. Testing search for 'beach vacation':")
-    status, response = make_request({
-        "query": "beach vacation",
-        "limit": 3
-    })
-    print(f"Status: {status}")
-    print(f"Response: {response}")
-    
-    # Test 2: Different query
-    print("\n2. Testing search for 'mountain hiking':")
-    status, response = make_request({
-        "query": "mountain hiking",
-        "limit": 3
-    })
-    print(f"Status: {status}")
-    print(f"Response: {response}")
+    tests = [
+        ("Testing search for 'beach vacation'", {
+            "query": "beach vacation",
+            "limit": 3
+        }),
+        ("Testing search for 'mountain hiking'", {
+            "query": "mountain hiking",
+            "limit": 3
+        }),
+        ("Testing search for 'temples and culture'", {
+            "query": "temples and culture",
+            "limit": 5
+        }),
+        ("Testing with missing query parameter (should fail)", {
+            "limit": 5
+        }),
+    ]
     
-    # Test 3: Cultural attractions
-    print("\n3. Testing search for 'temples and culture':")
-    status, response = make_request({
-        "query": "temples and culture",
-        "limit": 5
-    })
-    print(f"Status: {status}")
-    print(f"Response: {response}")
+    # The requests are independent, so issue them concurrently and print in order
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        results = list(executor.map(lambda test: make_request(test[1]), tests))
     
-    # Test 4: Missing query parameter (should fail)
-    print("\n4. Testing with missing query parameter (should fail):")
-    status, response = make_request({
-        "limit": 5
-    })
-    print(f"Status: {status}")
-    print(f"Response: {response}")
+    for number, ((description, _), (status, response)) in enumerate(zip(tests, results), start=1):
+        print(f"\n{number}. {description}:")
+        print(f"Status: {status}")
+        print(f"Response: {response}")
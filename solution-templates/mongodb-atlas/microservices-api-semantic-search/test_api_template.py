@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
+import base64
 import boto3
 import json
 import requests
+import struct
 from botocore.auth import SigV4Auth
 from botocore.awsrequest import AWSRequest
 
@@ -35,6 +37,18 @@ def generate_embedding(text):
         # Fallback to example vector if Bedrock fails
         return [0.1, 0.2, 0.3] + [0.0] * 1533
 
+def pack_vector_int8(vector):
+    """
+    Scalar-quantize a vector to int8 and encode it as a BSON Binary vector
+    (subtype 9, int8) in Extended JSON, matching how the import script
+    stores details_embedding
+    """
+    scale = max(abs(v) for v in vector) / 127 or 1
+    quantized = [round(v / scale) for v in vector]
+    # Header: dtype byte (0x03 = INT8) followed by a zero padding byte
+    data = b'\x03\x00' + struct.pack(f'<{len(quantized)}b', *quantized)
+    return {"$binary": {"base64": base64.b64encode(data).decode(), "subType": "09"}}
+
 def make_request(endpoint, data):
     api_url = "${api_url}"
     url = f"{api_url}/{endpoint}"
@@ -82,7 +96,7 @@ if __name__ == "__main__":
             "$vectorSearch": {
                 "index": "vector_index",
                 "path": "details_embedding",
-                "queryVector": query_vector,
+                "queryVector": pack_vector_int8(query_vector),
                 "numCandidates": 100,
                 "limit": 5
             }
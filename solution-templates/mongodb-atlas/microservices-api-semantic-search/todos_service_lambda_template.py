@@ -1,17 +1,102 @@
 #!/usr/bin/env python3
-import json
+import hashlib
+import hmac
+import orjson
 import boto3
 import os
-from datetime import datetime
-from botocore.auth import SigV4Auth
-from botocore.awsrequest import AWSRequest
-from urllib.request import urlopen, Request
-from urllib.error import HTTPError
+import re
+import time
+from datetime import datetime, timezone
+from urllib.parse import quote, urlsplit
+from urllib3 import PoolManager, Retry, Timeout, make_headers
 
 # Environment variables (set by Terraform)
 MONGODB_API_URL = "${mongodb_api_url}"
 AWS_REGION = os.environ['AWS_REGION']
 
+# Clients are created once per container and reused across warm invocations
+_SESSION = boto3.Session()
+_CREDS = _SESSION.get_credentials()
+_HTTP = PoolManager(
+    num_pools=10,
+    maxsize=50,
+    retries=Retry(total=2, backoff_factor=0.1),
+    timeout=Timeout(connect=3, read=10)
+)
+
+# SigV4 parts that are fixed for every Data API call are computed once per container
+SIGNING_SERVICE = 'execute-api'
+_API_HOST = urlsplit(MONGODB_API_URL).netloc
+_API_BASE_PATH = urlsplit(MONGODB_API_URL).path
+_SCOPE_SUFFIX = f"/{AWS_REGION}/{SIGNING_SERVICE}/aws4_request"
+_SIGNING_KEYS = {}  # (secret_key, date_stamp) -> derived signing key
+
+# Ask for compressed responses; urllib3 decodes them transparently
+_ACCEPT_ENCODING = make_headers(accept_encoding=True)['accept-encoding']
+
+# Todos get server-generated ObjectId _ids: 24 hexadecimal characters
+_OBJECT_ID_RE = re.compile(r'[0-9a-fA-F]{24}')
+
+# Last formatted timestamp as [epoch second, ISO string], shared by warm invocations
+_LAST_TS = [0, '']
+
+def _signing_key(secret_key, date_stamp):
+    """
+    Derive the SigV4 signing key; it only changes with the credentials or the
+    UTC date, so one derivation serves every request until midnight
+    """
+    cache_key = (secret_key, date_stamp)
+    key = _SIGNING_KEYS.get(cache_key)
+    if key is None:
+        key = ('AWS4' + secret_key).encode()
+        for part in (date_stamp, AWS_REGION, SIGNING_SERVICE, 'aws4_request'):
+            key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+        _SIGNING_KEYS.clear()
+        _SIGNING_KEYS[cache_key] = key
+    return key
+
+def sign_request(endpoint, body, extra_headers=None):
+    """
+    Build SigV4-signed headers for a POST of body (bytes) to a MongoDB Data API endpoint;
+    extra_headers (lowercase names) are sent and signed along with the defaults
+    """
+    credentials = _CREDS.get_frozen_credentials()
+    amz_date = time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())
+    date_stamp = amz_date[:8]
+    
+    headers = {'content-type': 'application/json', 'host': _API_HOST, 'x-amz-date': amz_date}
+    if extra_headers:
+        headers.update(extra_headers)
+    if credentials.token:
+        headers['x-amz-security-token'] = credentials.token
+    signed_headers = ';'.join(sorted(headers))
+    canonical_headers = ''.join(f"{name}:{headers[name]}\n" for name in sorted(headers))
+    
+    canonical_request = '\n'.join([
+        'POST',
+        quote(_API_BASE_PATH + endpoint, safe='/~'),
+        '',
+        canonical_headers,
+        signed_headers,
+        hashlib.sha256(body).hexdigest()
+    ])
+    scope = f"{date_stamp}{_SCOPE_SUFFIX}"
+    string_to_sign = '\n'.join([
+        'AWS4-HMAC-SHA256',
+        amz_date,
+        scope,
+        hashlib.sha256(canonical_request.encode()).hexdigest()
+    ])
+    signature = hmac.new(
+        _signing_key(credentials.secret_key, date_stamp), string_to_sign.encode(), hashlib.sha256
+    ).hexdigest()
+    
+    headers['authorization'] = (
+        f"AWS4-HMAC-SHA256 Credential={credentials.access_key}/{scope}, "
+        f"SignedHeaders={signed_headers}, Signature={signature}"
+    )
+    return headers
+
 def call_mongodb_api(endpoint, data):
     """
     Call MongoDB Data API with AWS SigV4 authentication
@@ -25,32 +110,46 @@ def call_mongodb_api(endpoint, data):
     """
     url = f"{MONGODB_API_URL}{endpoint}"
     
-    # Create AWS request with SigV4 signing
-    session = boto3.Session()
-    credentials = session.get_credentials()
-    
-    request = AWSRequest(
-        method='POST',
-        url=url,
-        data=json.dumps(data),
-        headers={'Content-Type': 'application/json'}
-    )
-    SigV4Auth(credentials, 'execute-api', AWS_REGION).add_auth(request)
-    
-    # Make the request using urllib
-    req = Request(url, data=request.body, headers=dict(request.headers))
+    # Sign the request with the cached SigV4 key
+    body = orjson.dumps(data)
+    headers = sign_request(endpoint, body, {'accept-encoding': _ACCEPT_ENCODING})
     
+    # Make the request over the pooled keep-alive connection
     try:
-        with urlopen(req) as response:
-            response_data = response.read().decode()
-            return json.loads(response_data)
-    except HTTPError as e:
-        error_body = e.read().decode() if hasattr(e, 'read') else str(e)
-        print(f"MongoDB API HTTP Error {e.code}: {error_body}")
-        raise Exception(f"MongoDB API error: {e.code}")
+        response = _HTTP.request('POST', url, body=body, headers=headers)
     except Exception as e:
         print(f"Error calling MongoDB API: {e}")
         raise
+    
+    if response.status >= 400:
+        print(f"MongoDB API HTTP Error {response.status}: {response.data.decode()}")
+        raise Exception(f"MongoDB API error: {response.status}")
+    
+    return orjson.loads(response.data)
+
+def now_iso():
+    """
+    Current UTC time as an ISO 8601 string at one-second resolution;
+    the string is only reformatted when the second changes
+    """
+    second = int(time.time())
+    if second != _LAST_TS[0]:
+        _LAST_TS[0] = second
+        _LAST_TS[1] = datetime.fromtimestamp(second, timezone.utc).replace(tzinfo=None).isoformat()
+    return _LAST_TS[1]
+
+def is_valid_object_id(todo_id):
+    """
+    Check whether a path id can be an ObjectId
+    """
+    return _OBJECT_ID_RE.fullmatch(todo_id) is not None
+
+def _oid(todo_id):
+    """
+    Extended JSON ObjectId for a todo id, so the Data API matches the indexed
+    ObjectId _id instead of comparing against a plain string
+    """
+    return {"$oid": todo_id}
 
 def list_todos():
     """
@@ -72,7 +171,7 @@ def get_todo_by_id(todo_id):
     data = {
         "database": "todos",
         "collection": "items",
-        "filter": {"_id": todo_id}
+        "filter": {"_id": _oid(todo_id)}
     }
     
     result = call_mongodb_api('findOne', data)
@@ -82,7 +181,7 @@ def create_todo(title, description=None):
     """
     Create a new todo
     """
-    now = datetime.utcnow().isoformat()
+    now = now_iso()
     
     document = {
         "title": title,
@@ -106,12 +205,12 @@ def update_todo(todo_id, updates):
     Update an existing todo
     """
     # Add updated_at timestamp
-    updates['updated_at'] = datetime.utcnow().isoformat()
+    updates['updated_at'] = now_iso()
     
     data = {
         "database": "todos",
         "collection": "items",
-        "filter": {"_id": todo_id},
+        "filter": {"_id": _oid(todo_id)},
         "update": {"$set": updates}
     }
     
@@ -125,12 +224,100 @@ def delete_todo(todo_id):
     data = {
         "database": "todos",
         "collection": "items",
-        "filter": {"_id": todo_id}
+        "filter": {"_id": _oid(todo_id)}
     }
     
     result = call_mongodb_api('deleteOne', data)
     return result
 
+def _response(status_code, body):
+    """
+    Build an API Gateway proxy response with a JSON body
+    """
+    return {
+        'statusCode': status_code,
+        'headers': {'Content-Type': 'application/json'},
+        'body': orjson.dumps(body).decode()
+    }
+
+def _handle_list(event, todo_id):
+    """
+    GET /todos - List all todos
+    """
+    return _response(200, {'todos': list_todos()})
+
+def _handle_get(event, todo_id):
+    """
+    GET /todos/{id} - Get specific todo
+    """
+    if not is_valid_object_id(todo_id):
+        return _response(400, {'error': 'invalid todo id'})
+    
+    todo = get_todo_by_id(todo_id)
+    if todo:
+        return _response(200, todo)
+    return _response(404, {'error': 'Todo not found'})
+
+def _handle_create(event, todo_id):
+    """
+    POST /todos - Create new todo
+    """
+    body = orjson.loads(event.get('body', '{}'))
+    title = body.get('title')
+    
+    if not title:
+        return _response(400, {'error': 'title is required'})
+    
+    return _response(201, create_todo(title, body.get('description')))
+
+def _handle_update(event, todo_id):
+    """
+    PUT /todos/{id} - Update existing todo
+    """
+    if not is_valid_object_id(todo_id):
+        return _response(400, {'error': 'invalid todo id'})
+    
+    body = orjson.loads(event.get('body', '{}'))
+    updates = {field: body[field] for field in ('title', 'description', 'completed') if field in body}
+    
+    if not updates:
+        return _response(400, {'error': 'No fields to update'})
+    
+    result = update_todo(todo_id, updates)
+    if result.get('modifiedCount', 0) > 0:
+        return _response(200, result)
+    return _response(404, {'error': 'Todo not found'})
+
+def _handle_delete(event, todo_id):
+    """
+    DELETE /todos/{id} - Delete todo
+    """
+    if not is_valid_object_id(todo_id):
+        return _response(400, {'error': 'invalid todo id'})
+    
+    result = delete_todo(todo_id)
+    if result.get('deletedCount', 0) > 0:
+        return _response(200, {'message': 'Todo deleted successfully'})
+    return _response(404, {'error': 'Todo not found'})
+
+def _handle_missing_id(event, todo_id):
+    """
+    PUT/DELETE without a todo id in the path
+    """
+    return _response(400, {'error': 'todo id is required'})
+
+# Routes keyed by (HTTP method, whether the path carries a todo id)
+ROUTES = {
+    ('GET', False): _handle_list,
+    ('GET', True): _handle_get,
+    ('POST', False): _handle_create,
+    ('POST', True): _handle_create,
+    ('PUT', True): _handle_update,
+    ('PUT', False): _handle_missing_id,
+    ('DELETE', True): _handle_delete,
+    ('DELETE', False): _handle_missing_id,
+}
+
 def lambda_handler(event, context):
     """
     Main Lambda handler for Todos Service
@@ -144,137 +331,16 @@ def lambda_handler(event, context):
     """
     try:
         http_method = event.get('httpMethod')
-        path = event.get('path', '')
-        path_parameters = event.get('pathParameters') or {}
-        
-        print(f"Processing {http_method} request to {path}")
-        
-        # GET /todos or GET /todos/{id}
-        if http_method == 'GET':
-            todo_id = path_parameters.get('id')
-            
-            if todo_id:
-                # Get specific todo
-                todo = get_todo_by_id(todo_id)
-                if todo:
-                    return {
-                        'statusCode': 200,
-                        'headers': {'Content-Type': 'application/json'},
-                        'body': json.dumps(todo)
-                    }
-                else:
-                    return {
-                        'statusCode': 404,
-                        'headers': {'Content-Type': 'application/json'},
-                        'body': json.dumps({'error': 'Todo not found'})
-                    }
-            else:
-                # List all todos
-                todos = list_todos()
-                return {
-                    'statusCode': 200,
-                    'headers': {'Content-Type': 'application/json'},
-                    'body': json.dumps({'todos': todos})
-                }
-        
-        # POST /todos - Create new todo
-        elif http_method == 'POST':
-            body = json.loads(event.get('body', '{}'))
-            title = body.get('title')
-            description = body.get('description')
-            
-            if not title:
-                return {
-                    'statusCode': 400,
-                    'headers': {'Content-Type': 'application/json'},
-                    'body': json.dumps({'error': 'title is required'})
-                }
-            
-            result = create_todo(title, description)
-            return {
-                'statusCode': 201,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps(result)
-            }
+        todo_id = (event.get('pathParameters') or {}).get('id')
         
-        # PUT /todos/{id} - Update existing todo
-        elif http_method == 'PUT':
-            todo_id = path_parameters.get('id')
-            if not todo_id:
-                return {
-                    'statusCode': 400,
-                    'headers': {'Content-Type': 'application/json'},
-                    'body': json.dumps({'error': 'todo id is required'})
-                }
-            
-            body = json.loads(event.get('body', '{}'))
-            updates = {}
-            
-            if 'title' in body:
-                updates['title'] = body['title']
-            if 'description' in body:
-                updates['description'] = body['description']
-            if 'completed' in body:
-                updates['completed'] = body['completed']
-            
-            if not updates:
-                return {
-                    'statusCode': 400,
-                    'headers': {'Content-Type': 'application/json'},
-                    'body': json.dumps({'error': 'No fields to update'})
-                }
-            
-            result = update_todo(todo_id, updates)
-            
-            if result.get('modifiedCount', 0) > 0:
-                return {
-                    'statusCode': 200,
-                    'headers': {'Content-Type': 'application/json'},
-                    'body': json.dumps(result)
-                }
-            else:
-                return {
-                    'statusCode': 404,
-                    'headers': {'Content-Type': 'application/json'},
-                    'body': json.dumps({'error': 'Todo not found'})
-                }
+        print(f"Processing {http_method} request to {event.get('path', '')}")
         
-        # DELETE /todos/{id} - Delete todo
-        elif http_method == 'DELETE':
-            todo_id = path_parameters.get('id')
-            if not todo_id:
-                return {
-                    'statusCode': 400,
-                    'headers': {'Content-Type': 'application/json'},
-                    'body': json.dumps({'error': 'todo id is required'})
-                }
-            
-            result = delete_todo(todo_id)
-            
-            if result.get('deletedCount', 0) > 0:
-                return {
-                    'statusCode': 200,
-                    'headers': {'Content-Type': 'application/json'},
-                    'body': json.dumps({'message': 'Todo deleted successfully'})
-                }
-            else:
-                return {
-                    'statusCode': 404,
-                    'headers': {'Content-Type': 'application/json'},
-                    'body': json.dumps({'error': 'Todo not found'})
-                }
+        handler = ROUTES.get((http_method, bool(todo_id)))
+        if handler is None:
+            return _response(405, {'error': 'Method not allowed'})
         
-        else:
-            return {
-                'statusCode': 405,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({'error': 'Method not allowed'})
-            }
+        return handler(event, todo_id)
     
     except Exception as e:
         print(f"Error in lambda_handler: {str(e)}")
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': 'Internal server error', 'details': str(e)})
-        }
+        return _response(500, {'error': 'Internal server error', 'details': str(e)})
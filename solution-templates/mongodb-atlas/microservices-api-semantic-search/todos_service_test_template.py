@@ -2,12 +2,14 @@
 import boto3
 import json
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from botocore.auth import SigV4Auth
 from botocore.awsrequest import AWSRequest
 
 # Detect current AWS region
 session = boto3.Session()
 current_region = session.region_name
+credentials = session.get_credentials()
 
 def make_request(method, path, data=None):
     """
@@ -24,9 +26,6 @@ def make_request(method, path, data=None):
     api_url = "${api_url}"
     url = f"{api_url}{path}"
     
-    session = boto3.Session()
-    credentials = session.get_credentials()
-    
     request_body = json.dumps(data) if data else None
     
     request = AWSRequest(
@@ -52,41 +51,45 @@ if __name__ == "__main__":
     
     created_todo_id = None
     
-    # Test 1: Create a new todo
-    print("\n1. Creating a new todo:")
-    print("-" * 60)
-    status, response = make_request('POST', '/todos', {
-        "title": "Complete workshop",
-        "description": "Finish the MongoDB Atlas REST API workshop"
-    })
-    print(f"Status: {status}")
-    print(f"Response: {response}")
+    # Tests 1-3 are independent creates, so issue them concurrently and print in order
+    create_tests = [
+        ("Creating a new todo", {
+            "title": "Complete workshop",
+            "description": "Finish the MongoDB Atlas REST API workshop"
+        }),
+        ("Creating another todo", {
+            "title": "Test API endpoints",
+            "description": "Verify all CRUD operations work correctly"
+        }),
+        ("Creating todo without title (should fail)", {
+            "description": "This should fail"
+        }),
+    ]
+    with ThreadPoolExecutor(max_workers=len(create_tests)) as executor:
+        create_results = list(executor.map(lambda test: make_request('POST', '/todos', test[1]), create_tests))
+    
+    for number, ((description, _), (status, response)) in enumerate(zip(create_tests, create_results), start=1):
+        print(f"\n{number}. {description}:")
+        print("-" * 60)
+        print(f"Status: {status}")
+        print(f"Response: {response}")
     
+    status, response = create_results[0]
     if status == 201:
         response_data = json.loads(response)
         created_todo_id = response_data.get('insertedId')
         print(f"Created todo ID: {created_todo_id}")
     
-    # Test 2: Create another todo
-    print("\n2. Creating another todo:")
-    print("-" * 60)
-    status, response = make_request('POST', '/todos', {
-        "title": "Test API endpoints",
-        "description": "Verify all CRUD operations work correctly"
-    })
-    print(f"Status: {status}")
-    print(f"Response: {response}")
-    
-    # Test 3: List all todos
-    print("\n3. Listing all todos:")
+    # Test 4: List all todos
+    print("\n4. Listing all todos:")
     print("-" * 60)
     status, response = make_request('GET', '/todos')
     print(f"Status: {status}")
     print(f"Response: {response}")
     
-    # Test 4: Update a todo (if we created one)
+    # Test 5: Update a todo (if we created one)
     if created_todo_id:
-        print(f"\n4. Updating todo (ID: {created_todo_id}):")
+        print(f"\n5. Updating todo (ID: {created_todo_id}):")
         print("-" * 60)
         status, response = make_request('PUT', f'/todos/{created_todo_id}', {
             "completed": True,
@@ -95,23 +98,14 @@ if __name__ == "__main__":
         print(f"Status: {status}")
         print(f"Response: {response}")
     
-    # Test 5: Delete a todo (if we created one)
+    # Test 6: Delete a todo (if we created one)
     if created_todo_id:
-        print(f"\n5. Deleting todo (ID: {created_todo_id}):")
+        print(f"\n6. Deleting todo (ID: {created_todo_id}):")
         print("-" * 60)
         status, response = make_request('DELETE', f'/todos/{created_todo_id}')
         print(f"Status: {status}")
         print(f"Response: {response}")
     
-    # Test 6: Create todo with missing title (should fail)
-    print("\n6. Creating todo without title (should fail):")
-    print("-" * 60)
-    status, response = make_request('POST', '/todos', {
-        "description": "This should fail"
-    })
-    print(f"Status: {status}")
-    print(f"Response: {response}")
-    
     # Test 7: List all remaining todos
     print("\n7. Final list of all todos:")
     print("-" * 60)